@@ -54,6 +54,10 @@ def toggle_debug():
     # Allow new components to be added dynamically
     settings[component] = new_state
     save_debug_settings(settings)
+
+    if component == "ph":
+        from services.ph_service import refresh_debug_flag
+        refresh_debug_flag()
     return jsonify({"message": f"Debug for {component} set to {new_state}"}), 200
     
 @debug_blueprint.route("/")
@@ -38,6 +38,10 @@ def api_set_status():
         return jsonify({"status": "failure", "error": "device, key, and state are required"}), 400
 
     set_status(device, key, state, message)
+    if device == "ph_probe":
+        # ph_service's cached state no longer matches; let it re-send
+        from services.ph_service import forget_status
+        forget_status(key)
     return jsonify({"status": "success"})
 
 @notifications_blueprint.route('/clear', methods=['POST'])
@@ -57,6 +61,10 @@ def api_clear_status():
         return jsonify({"status": "failure", "error": "device and key are required"}), 400
 
     clear_status(device, key)
+    if device == "ph_probe":
+        # Let ph_service re-send this status on its next update
+        from services.ph_service import forget_status
+        forget_status(key)
     return jsonify({"status": "success"})
 
 
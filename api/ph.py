@@ -1,7 +1,7 @@
 # File: api/ph.py
 
 from flask import Blueprint, jsonify, request
-from services.ph_service import enqueue_calibration, get_latest_ph_reading
+from services.ph_service import calibrate_ph, get_latest_ph_reading
 from utils.settings_utils import load_settings, save_settings
 
 ph_blueprint = Blueprint('ph', __name__)
@@ -27,8 +27,9 @@ def ph_reading():
 def ph_calibration(level):
     """
     Calibrate the pH sensor at a specific level (low, mid, high, or clear).
+    Waits for the probe to acknowledge or reject the command.
     """
-    response = enqueue_calibration(level)
+    response = calibrate_ph(level)
     if response["status"] == "success":
         return jsonify(response)
     return jsonify(response), 400
@@ -296,6 +296,9 @@ def update_settings():
     except ImportError:
         print("[WARN] Could not import log_service to reset cache.")
 
+    from services.ph_service import reset_settings_cache
+    reset_settings_cache()
+
     emit_status_update()
     return jsonify({"status": "success", "settings": current_settings})
 
@@ -419,6 +422,9 @@ def import_settings():
         except ImportError:
             print("[WARN] Could not import log_service to reset cache.")
 
+        from services.ph_service import reset_settings_cache
+        reset_settings_cache()
+
         # Try re-init logic
         try:
             from services.ph_service import restart_serial_reader
@@ -4,41 +4,80 @@ print(f"LOADED ph_service.py from {__file__}", flush=True)
 import eventlet
 eventlet.monkey_patch()
 
+import os
 import signal
 import serial
-import subprocess
 import re
-from queue import Queue
-from datetime import datetime, timedelta
-from eventlet import tpool
+import sys
+import time
 from eventlet import semaphore, event
+from eventlet.green import select
+from eventlet.queue import LightQueue, Empty, Full
 from collections import deque
 
 from services.error_service import set_error, clear_error
 from services.notification_service import set_status, clear_status, report_condition_error
-from utils.settings_utils import load_settings, save_settings  # Ensure import is present
+from utils.settings_utils import load_settings, save_settings, SETTINGS_FILE  # Ensure import is present
 
-# Shared queue for commands sent to the probe
-command_queue = Queue()
+# Shared queue for commands sent to the probe (greenlet-native, no OS locks)
+command_queue = LightQueue()
 stop_event = event.Event()
 
-ph_lock = semaphore.Semaphore()
-
-# Regex: stricter for 0-14 with 0-3 decimals
-PH_FLOAT_REGEX = re.compile(r'^([0-9]|1[0-4])(?:\.\d{1,3})?$')
-
-# Response codes from datasheet
-RESPONSE_CODES = {"*OK", "*ER", "*OV", "*UV", "*RS", "*RE", "*SL", "*WA"}
-
-buffer = ""             # Centralized buffer for incoming serial data
+# One pattern for every line the probe sends; parse_buffer dispatches on
+# m.lastgroup: a response code, a "?Slope,..." reply, or a pH reading
+# (stricter for 0-14 with 0-3 decimals).
+# Matched against raw bytes: readings go straight to float() undecoded.
+LINE_REGEX = re.compile(
+    rb'(?P<code>\*[A-Z]{2})'
+    rb'|(?i:\?slope,)(?P<slope>.*)'
+    rb'|(?P<ph>(?:[0-9]|1[0-4])(?:\.[0-9]{1,3})?)'
+)
+
+def _on_command_error(code):
+    report_condition_error("ph_probe", "command_error", f"Error response for command '{last_sent_command}'")
+
+def _on_voltage_issue(code):
+    report_condition_error("ph_probe", "voltage_issue", f"Voltage error: {code}")
+
+# Response codes from datasheet -> extra handling for a reply to our command
+# (None = just clears the outstanding command)
+RESPONSE_CODES = {
+    "*OK": None,
+    "*ER": _on_command_error,
+    "*OV": _on_voltage_issue,
+    "*UV": _on_voltage_issue,
+    "*RS": None,
+    "*RE": None,
+    "*SL": None,
+    "*WA": None,
+}
+
+# Calibration level -> probe command, shared by calibrate_ph and enqueue_calibration
+CALIBRATION_COMMANDS = {
+    'low': 'Cal,low,4.00',
+    'mid': 'Cal,mid,7.00',
+    'high': 'Cal,high,10.00',
+    'clear': 'Cal,clear'
+}
+
+# Wire bytes for the commands this module sends, terminator included
+COMMAND_BYTES = {
+    cmd: (cmd + '\r').encode()
+    for cmd in (*CALIBRATION_COMMANDS.values(), "C,0", "C,1", "C,2", "Slope,?")
+}
+
+buffer = bytearray()    # Centralized buffer for incoming serial bytes
+_read_pos = 0           # Start of the first unconsumed byte in `buffer`
+_scan_pos = 0           # Bytes before this are known to hold no b"\r"
 latest_ph_value = None  # Store the most recent pH reading
 last_sent_command = None
-COMMAND_TIMEOUT = 10
-MAX_BUFFER_LENGTH = 100
+last_command_time = 0.0  # time.monotonic() when last_sent_command went out
+COMMAND_TIMEOUT = 10     # seconds to wait for *OK/*ER before moving on
+MAX_BUFFER_LENGTH = 4096  # Cap on unterminated bytes left after a parse pass
 
 old_ph_value = None  # stores the previous pH value
-ph_recent_values = []  # stores last 20 readings
 PH_ROLLING_WINDOW = 20
+ph_recent_values = deque(maxlen=PH_ROLLING_WINDOW)  # last 20 readings, oldest evicted on append
 
 ser = None  # Global variable to track the serial connection
 
@@ -51,56 +90,294 @@ calibration_mode = False
 def set_ph_calibration_mode(enabled):
     global calibration_mode
     calibration_mode = bool(enabled)
-    log_with_timestamp(f"[DEBUG] pH calibration mode set to {calibration_mode}")
+    log_with_timestamp("[DEBUG] pH calibration mode set to %s", calibration_mode)
 
 def get_ph_calibration_mode():
     global calibration_mode
     return calibration_mode
 
-def log_with_timestamp(message):
+# Cached "ph" debug toggle so log calls don't re-read debug_settings.json.
+_ph_debug = False
+
+def refresh_debug_flag():
+    """
+    Re-reads the "ph" debug toggle into the module cache.
+    Called at the top of each serial_reader pass and from the debug toggle
+    endpoint.
+    """
+    global _ph_debug
     from status_namespace import is_debug_enabled
-    """Logs messages only if debugging is enabled for pH."""
-    if is_debug_enabled("ph"):
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+    _ph_debug = bool(is_debug_enabled("ph"))
+
+# Log prefix, re-formatted at most once per wall-clock second
+_ts_last_sec = None
+_ts_str = ""
+
+# Debug lines are written by a drainer greenlet in batches, one flush each
+LOG_QUEUE_SIZE = 1024
+_log_q = LightQueue(maxsize=LOG_QUEUE_SIZE)
+_log_drainer = None
+_log_dropped = 0  # Lines lost (queue full or write failed) since the last write
+
+def _flush_log_queue(batch=None):
+    """
+    Writes `batch` plus everything still queued to stdout with one flush,
+    noting how many lines were dropped since the last write. A failed
+    write is counted as dropped rather than raised, so the drainer
+    greenlet survives a broken stdout.
+    """
+    global _log_dropped
+    batch = batch or []
+    while True:
+        try:
+            batch.append(_log_q.get_nowait())
+        except Empty:
+            break
+    lost = len(batch)
+    dropped, _log_dropped = _log_dropped, 0
+    if dropped:
+        batch.append(f"[{_ts_str}] [DEBUG] {dropped} log line(s) dropped.")
+    if batch:
+        try:
+            sys.stdout.write("\n".join(batch) + "\n")
+            sys.stdout.flush()
+        except (OSError, ValueError):
+            _log_dropped += dropped + lost
+
+def _drain_log_queue():
+    """Writes queued log lines to stdout, flushing once per batch."""
+    while True:
+        _flush_log_queue([_log_q.get()])
+        eventlet.sleep(0.05)
+
+def log_with_timestamp(message, *args):
+    """
+    Logs messages only if debugging is enabled for pH.
+    Extra `args` are %-formatted into `message` only when the line is logged,
+    so hot call sites pay nothing for formatting while debug is off.
+    """
+    global _ts_last_sec, _ts_str, _log_drainer, _log_dropped
+    if _ph_debug:
+        sec = int(time.time())
+        if sec != _ts_last_sec:
+            _ts_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(sec))
+            _ts_last_sec = sec
+        if args:
+            message = message % args
+        if _log_drainer is None or _log_drainer.dead:
+            _log_drainer = eventlet.spawn(_drain_log_queue)
+        try:
+            _log_q.put_nowait(f"[{_ts_str}] {message}")
+        except Full:
+            _log_dropped += 1  # Drop rather than stall the reader when stdout falls behind
 
 def enqueue_command(command, command_type="general"):
     """
     Place a command into the queue.
     command_type can be "calibration", "slope_query", or "general".
     """
-    log_with_timestamp(f"[DEBUG] enqueue_command('{command}', type='{command_type}') called.")
+    log_with_timestamp("[DEBUG] enqueue_command('%s', type='%s') called.", command, command_type)
     command_queue.put({"command": command, "type": command_type})
+    _wake_reader()  # Send it now rather than on the next read or timeout
 
 def send_command_to_probe(ser, command):
     """
     Sends a command string to the pH probe, appending '\r'.
+    Known commands use their pre-encoded COMMAND_BYTES entry.
     """
     global last_sent_command
     try:
-        log_with_timestamp(f"[DEBUG] Actually writing to serial: {command!r}")
-        ser.write((command + '\r').encode())
-        last_sent_command = command
+        log_with_timestamp("[DEBUG] Actually writing to serial: %r", command)
+        data = COMMAND_BYTES.get(command)
+        if data is None:
+            data = (command + '\r').encode()
+        ser.write(data)
     except Exception as e:
-        log_with_timestamp(f"Error sending command '{command}': {e}")
+        log_with_timestamp("Error sending command '%s': %s", command, e)
+        last_sent_command = None
+
+def _dispatch(ser, command):
+    """
+    Marks `command` as the outstanding command and sends it in one step,
+    so there is no window where it is on the wire but not yet tracked.
+    """
+    global last_sent_command, last_command_time
+    last_sent_command = command
+    last_command_time = time.monotonic()
+    send_command_to_probe(ser, command)
+
+def _send_next_queued(ser):
+    """
+    Pops the next queued command (if any) and sends it to the probe.
+    Uses get_nowait() so the check and the pop are a single queue operation.
+    """
+    try:
+        next_cmd = command_queue.get_nowait()
+    except Empty:
+        return
+    log_with_timestamp("[DEBUG] parse_buffer: sending next queued command: %s", next_cmd["command"])
+    _dispatch(ser, next_cmd["command"])
+
+def _service_command_queue(ser):
+    """
+    Sends the next queued command if none is outstanding. A command left
+    unanswered for COMMAND_TIMEOUT is abandoned so the queue cannot stall
+    behind a lost reply.
+    """
+    global last_sent_command
+    if last_sent_command is not None:
+        if time.monotonic() - last_command_time <= COMMAND_TIMEOUT:
+            return
+        log_with_timestamp("[DEBUG] No response to '%s' within %ss; moving on.", last_sent_command, COMMAND_TIMEOUT)
+        last_sent_command = None
+    _send_next_queued(ser)
+
+# Settings snapshot shared by the parser, reader and get_latest_ph_reading;
+# reloaded only when settings.json changes
+_cached_settings = None
+_cached_settings_mtime = None
+_settings_lock = semaphore.Semaphore()
+
+def _get_cached_settings():
+    """
+    Returns the cached settings dict, re-reading settings.json only when its
+    st_mtime_ns differs from the last load. Treat the result as read-only.
+    """
+    global _cached_settings, _cached_settings_mtime
+    try:
+        mtime = os.stat(SETTINGS_FILE).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    if _cached_settings is not None and mtime == _cached_settings_mtime:
+        return _cached_settings
+    with _settings_lock:
+        # Another caller may have reloaded while we waited.
+        if _cached_settings is None or mtime != _cached_settings_mtime:
+            _cached_settings = load_settings()
+            _cached_settings_mtime = mtime
+        return _cached_settings
+
+def reset_settings_cache():
+    """Forces the next _get_cached_settings() call to reload from disk."""
+    global _cached_settings
+    _cached_settings = None
 
 # Track how many times in the past minute we've had a "jump > 1 pH"
-ph_jumps = []  # list of datetime objects when a big jump occurred
+ph_jumps = deque()  # monotonic times of big jumps, oldest first, trimmed to the last 60s
 
-# Track last time we successfully parsed a reading
+# Track last time we successfully parsed a reading (time.monotonic())
 last_read_time = None
 
 # Slope data + event
 slope_event = event.Event()
 slope_data = None
 
+# calibrate_ph() waiting for its command's *OK/*ER: (command, Event) or None
+CALIBRATION_TIMEOUT = 5  # seconds
+_calibration_waiter = None
+
+# Last (state, stable, message, monotonic time) forwarded to set_status()
+# per ph_probe key
+_ph_status = {}
+STATUS_REFRESH_INTERVAL = 30  # seconds between updates that only reword a status
+
+def _set_status_if_changed(key, state, message="", stable=None):
+    """
+    set_status() for the ph_probe device, skipped when `key` already shows
+    the same state: every accepted reading would otherwise re-record and
+    re-broadcast it. `stable` is what must also match for an update to be
+    a repeat (defaults to `message`); when only the rest of the message
+    differs, such as a running average, it is refreshed at most every
+    STATUS_REFRESH_INTERVAL. Returns True if the state for `key` changed.
+    """
+    if stable is None:
+        stable = message
+    now = time.monotonic()
+    previous = _ph_status.get(key)
+    if previous is not None and previous[:2] == (state, stable):
+        if previous[2] == message or now - previous[3] < STATUS_REFRESH_INTERVAL:
+            return False
+    _ph_status[key] = (state, stable, message, now)
+    set_status("ph_probe", key, state, message)
+    return previous is None or previous[0] != state
+
+def forget_status(key):
+    """
+    Drops the cached ph_probe status for `key` so the next update is
+    forwarded. Called when the UI sets or clears that notification.
+    """
+    _ph_status.pop(key, None)
+
+def _clear_status(key):
+    """clear_status() for the ph_probe device, forgetting the cached state."""
+    forget_status(key)
+    clear_status("ph_probe", key)
+
+def _emit_status():
+    """
+    Pushes a status update right away. parse_buffer only calls this when a
+    ph_probe status changed; new readings on their own are picked up by the
+    periodic broadcast_status loop.
+    """
+    from status_namespace import emit_status_update
+    emit_status_update()
+
+# Whitespace trimmed around a line; the probe may prefix lines with "\n"
+_LINE_WS = b" \t\n"
+
+def _next_line():
+    """
+    Returns the (start, end) span in `buffer` of the next complete
+    '\r'-terminated line with surrounding whitespace trimmed, or None if no
+    terminator is buffered yet. Nothing is copied: parse_buffer matches the
+    span in place. Framing only: parse_buffer does all the dispatching.
+
+    Consumed lines are skipped by advancing `_read_pos` rather than deleting
+    them one by one; _compact_buffer() drops them in a single move per pass.
+    A partial line is scanned once: the search resumes at `_scan_pos`.
+    """
+    global _read_pos, _scan_pos
+    idx = buffer.find(b"\r", _scan_pos)
+    if idx < 0:
+        _scan_pos = len(buffer)
+        return None
+    start, end = _read_pos, idx
+    while start < end and buffer[start] in _LINE_WS:
+        start += 1
+    while end > start and buffer[end - 1] in _LINE_WS:
+        end -= 1
+    _read_pos = _scan_pos = idx + 1
+    return start, end
+
+def _compact_buffer():
+    """Discards the bytes already consumed by _next_line()."""
+    global _read_pos, _scan_pos
+    if _read_pos:
+        del buffer[:_read_pos]
+        _scan_pos -= _read_pos
+        _read_pos = 0
+
+def _drop_oldest(count):
+    """Deletes the first `count` bytes of `buffer`, keeping the cursors valid."""
+    global _read_pos, _scan_pos
+    del buffer[:count]
+    _read_pos = max(0, _read_pos - count)
+    _scan_pos = max(0, _scan_pos - count)
+
+def _clear_buffer():
+    """Empties `buffer` and its cursors together."""
+    global _read_pos, _scan_pos
+    buffer.clear()
+    _read_pos = _scan_pos = 0
+
 def parse_buffer(ser):
     """
-    Reads data from `buffer`, splitting on '\r',
+    Reads data from `buffer`, splitting on b'\r',
     and applies these rules for pH readings, slope, etc.
 
     - If line is a response code (e.g., "*OK", "*ER", "*OV"), handle it (log/alert for errors like voltage issues).
     - If line starts with "?SLOPE", it's slope info from the pH probe.
-    - Otherwise, if it matches a numeric pH float (PH_FLOAT_REGEX), we parse it:
+    - Otherwise, if it matches a numeric pH float (LINE_REGEX "ph" group), we parse it:
       * If 0.0 or 14.0 => unrealistic reading => report_condition_error
       * If <1.0 => ignore
       * If jump > threshold (configurable, default 1.0) => track big jumps and possibly report_condition_error for "unstable_readings"
@@ -108,70 +385,84 @@ def parse_buffer(ser):
       * If out of recommended range => report_condition_error for "out_of_range"
       * Else mark the reading "ok"
     """
-    global buffer, latest_ph_value, last_sent_command
-    global old_ph_value, last_read_time, ph_jumps
+    global latest_ph_value, last_sent_command
+    global old_ph_value, last_read_time
     global slope_data, slope_event
-    global ph_recent_values
 
-    settings = load_settings()  # Load once per parse cycle for configs
+    settings = _get_cached_settings()  # No disk read unless settings.json changed
     jump_threshold = settings.get("ph_jump_threshold", 1.0)
     median_window_size = settings.get("ph_median_window", 5)
     stability_threshold = settings.get("ph_stability_threshold", 0.2)
+    ph_min = settings.get("ph_range", {}).get("min", 5.5)
+    ph_max = settings.get("ph_range", {}).get("max", 6.5)
+
+    _service_command_queue(ser)
 
-    if last_sent_command is None and not command_queue.empty():
-        next_cmd = command_queue.get()
-        last_sent_command = next_cmd["command"]
-        log_with_timestamp(f"[DEBUG] parse_buffer: Taking next command from queue: {last_sent_command}")
-        send_command_to_probe(ser, next_cmd["command"])
+    # Set when a ph_probe status transitions during this pass
+    status_changed = False
 
-    while '\r' in buffer:
-        line, buffer = buffer.split('\r', 1)
-        line = line.strip()
-        if not line:
+    while True:
+        span = _next_line()
+        if span is None:
+            break
+        start, end = span
+        if start == end:
             log_with_timestamp("[DEBUG] parse_buffer: skipping empty line.")
             continue
 
-        log_with_timestamp(f"[DEBUG] parse_buffer: got line '{line}'")
+        if _ph_debug:
+            log_with_timestamp("[DEBUG] parse_buffer: got line %r", bytes(buffer[start:end]))
+
+        # A single match on the buffer span classifies the line; anything
+        # unrecognised is dropped here and never reaches float().
+        m = LINE_REGEX.fullmatch(buffer, start, end)
+        if m is None:
+            if _ph_debug:
+                log_with_timestamp("[DEBUG] parse_buffer ignoring unrecognised line %r", bytes(buffer[start:end]))
+            continue
+        kind = m.lastgroup
 
         # ---------------------------------------------------------
         # 1) Check for response codes
         # ---------------------------------------------------------
-        if line in RESPONSE_CODES:
+        if kind == "code":
+            # Response codes are rare and pure ASCII; decode for the str table.
+            line = m.group("code").decode("ascii")
+            if line not in RESPONSE_CODES:
+                log_with_timestamp("[DEBUG] parse_buffer ignoring unknown response code '%s'", line)
+                continue
             if last_sent_command:
-                log_with_timestamp(f"[DEBUG] parse_buffer: response '{line}' for command {last_sent_command}")
-                if line == "*ER":
-                    report_condition_error("ph_probe", "command_error", f"Error response for command '{last_sent_command}'")
-                elif line in {"*OV", "*UV"}:
-                    report_condition_error("ph_probe", "voltage_issue", f"Voltage error: {line}")
+                log_with_timestamp("[DEBUG] parse_buffer: response '%s' for command %s", line, last_sent_command)
+                handler = RESPONSE_CODES[line]
+                if handler:
+                    handler(line)
+                waiter = _calibration_waiter
+                if waiter and waiter[0] == last_sent_command and line in ("*OK", "*ER"):
+                    waiter[1].send(line)
                 last_sent_command = None
             else:
-                log_with_timestamp(f"[DEBUG] parse_buffer: unexpected '{line}' (no command in progress)")
+                log_with_timestamp("[DEBUG] parse_buffer: unexpected '%s' (no command in progress)", line)
 
-            if not command_queue.empty():
-                next_cmd = command_queue.get()
-                last_sent_command = next_cmd["command"]
-                log_with_timestamp(f"[DEBUG] parse_buffer: Now sending next queued command: {last_sent_command}")
-                send_command_to_probe(ser, next_cmd["command"])
+            _send_next_queued(ser)
             continue
 
         # ---------------------------------------------------------
         # 2) Check for slope data lines like "?SLOPE,110.2,92.1,4.67"
         # ---------------------------------------------------------
-        if line.upper().startswith("?SLOPE,"):
-            log_with_timestamp(f"[DEBUG] parse_buffer got slope line: {line}")
+        if kind == "slope":
+            line = m.group(0).decode("ascii", errors="replace")
+            log_with_timestamp("[DEBUG] parse_buffer got slope line: %s", line)
             try:
-                payload = line[7:]
-                parts = payload.split(",")
-                acid = float(parts[0])
-                base = float(parts[1])
-                offset = float(parts[2])
+                # Fixed "?Slope,<acid>,<base>,<offset>" layout: the regex already
+                # stripped the prefix, so split exactly the three fields.
+                acid, base, offset = map(float, m.group("slope").split(b",", 2))
 
                 slope_data = {
                     "acid_slope": acid,
                     "base_slope": base,
                     "offset": offset
                 }
-                log_with_timestamp(f"[DEBUG] parse_buffer: slope_data set to {slope_data}")
+                log_with_timestamp("[DEBUG] parse_buffer: slope_data set to %s", slope_data)
 
                 s = load_settings()
                 if "calibration" not in s:
@@ -181,183 +472,248 @@ def parse_buffer(ser):
                 s["calibration"]["ph_probe"]["slope"] = slope_data
                 save_settings(s)
 
-                log_with_timestamp(f"[DEBUG] Slope data saved: {slope_data}")
+                log_with_timestamp("[DEBUG] Slope data saved: %s", slope_data)
                 last_sent_command = None
                 slope_event.send()
 
-                if not command_queue.empty():
-                    nxt = command_queue.get()
-                    last_sent_command = nxt["command"]
-                    log_with_timestamp(f"[DEBUG] parse_buffer: sending next queued command: {last_sent_command}")
-                    send_command_to_probe(ser, nxt["command"])
+                _send_next_queued(ser)
             except Exception as e:
-                log_with_timestamp(f"Error parsing slope line '{line}': {e}")
+                log_with_timestamp("Error parsing slope line '%s': %s", line, e)
             continue
 
         # ---------------------------------------------------------
-        # 3) Otherwise, assume it might be a numeric pH reading
+        # 3) Otherwise, it is a numeric pH reading (float() accepts bytes)
         # ---------------------------------------------------------
-        if not PH_FLOAT_REGEX.match(line):
-            log_with_timestamp(f"[DEBUG] parse_buffer ignoring line '{line}': does not match PH_FLOAT_REGEX")
+        # LINE_REGEX caps readings at 3 decimals, so no round() is needed.
+        ph_value = float(m.group("ph"))
+        status_changed |= _set_status_if_changed("reading", "ok", "Receiving readings.")
+        if _ph_debug:
+            log_with_timestamp("[DEBUG] parse_buffer: recognized numeric pH => %s", ph_value)
+
+        if ph_value == 0 or ph_value == 14:
+            report_condition_error("ph_probe", "unrealistic_reading", f"Unrealistic pH: {ph_value}")
             continue
 
-        try:
-            ph_value = round(float(line), 3)
-            set_status("ph_probe", "reading", "ok", "Receiving readings.")
-            log_with_timestamp(f"[DEBUG] parse_buffer: recognized numeric pH => {ph_value}")
+        if ph_value < 1.0:
+            if _ph_debug:
+                log_with_timestamp("[DEBUG] parse_buffer ignoring line %r: pH <1.0 (noise?). Got %s", m.group(0), ph_value)
+            continue
 
-            if ph_value == 0 or ph_value == 14:
-                report_condition_error("ph_probe", "unrealistic_reading", f"Unrealistic pH: {ph_value}")
-                continue
+        ph_median_window.append(ph_value)
+        if len(ph_median_window) < median_window_size:
+            if _ph_debug:
+                log_with_timestamp("[DEBUG] Building median window (%s/%s); holding.", len(ph_median_window), median_window_size)
+            continue
+        filtered_ph = sorted(ph_median_window)[median_window_size // 2]
+        if _ph_debug:
+            log_with_timestamp("[DEBUG] Filtered pH (median of %s): %s", median_window_size, filtered_ph)
+
+        # NEW: Skip stability variance check if in calibration mode
+        if not calibration_mode:
+            if len(ph_median_window) >= 3:
+                # Index the last three directly instead of copying the deque.
+                recent_3 = (ph_median_window[-3], ph_median_window[-2], ph_median_window[-1])
+                variance = max(recent_3) - min(recent_3)
+                if variance > stability_threshold:
+                    if _ph_debug:
+                        log_with_timestamp("[DEBUG] Discarded unstable reading (var %.2f > %s): %s", variance, stability_threshold, recent_3)
+                    continue
 
-            if ph_value < 1.0:
-                raise ValueError(f"Ignoring pH <1.0 (noise?). Got {ph_value}")
+        if old_ph_value is None:
+            delta = 0.0
+        else:
+            delta = abs(filtered_ph - old_ph_value)
 
-            ph_median_window.append(ph_value)
-            if len(ph_median_window) < median_window_size:
-                log_with_timestamp(f"[DEBUG] Building median window ({len(ph_median_window)}/{median_window_size}); holding.")
-                continue
-            filtered_ph = sorted(ph_median_window)[median_window_size // 2]
-            log_with_timestamp(f"[DEBUG] Filtered pH (median of {median_window_size}): {filtered_ph}")
-
-            # NEW: Skip stability variance check if in calibration mode
-            if not calibration_mode:
-                if len(ph_median_window) >= 3:
-                    recent_3 = list(ph_median_window)[-3:]
-                    variance = max(recent_3) - min(recent_3)
-                    if variance > stability_threshold:
-                        log_with_timestamp(f"[DEBUG] Discarded unstable reading (var {variance:.2f} > {stability_threshold}): {recent_3}")
-                        continue
+        if _ph_debug:
+            log_with_timestamp("[DEBUG] parse_buffer: old_ph_value=%s, delta=%.2f", old_ph_value, delta)
 
-            if old_ph_value is None:
-                delta = 0.0
-            else:
-                delta = abs(filtered_ph - old_ph_value)
+        # NEW: Skip jump check if in calibration mode
+        if not calibration_mode:
+            if old_ph_value is not None and delta > jump_threshold:
+                now = time.monotonic()
+                ph_jumps.append(now)
+                cutoff = now - 60.0
+                while ph_jumps and ph_jumps[0] < cutoff:
+                    ph_jumps.popleft()
 
-            log_with_timestamp(f"[DEBUG] parse_buffer: old_ph_value={old_ph_value}, delta={delta:.2f}")
+                if len(ph_jumps) > 5:
+                    report_condition_error("ph_probe", "persistent_unstable_readings", f"{len(ph_jumps)} big jumps (> {jump_threshold}) in last 60s.")
 
-            # NEW: Skip jump check if in calibration mode
-            if not calibration_mode:
-                if old_ph_value is not None and delta > jump_threshold:
-                    now = datetime.now()
-                    ph_jumps.append(now)
-                    cutoff = now - timedelta(seconds=60)
-                    ph_jumps = [t for t in ph_jumps if t >= cutoff]
+                if _ph_debug:
+                    log_with_timestamp("[DEBUG] Ignored jump (delta %.2f > %s)", delta, jump_threshold)
+                continue
 
-                    if len(ph_jumps) > 5:
-                        report_condition_error("ph_probe", "persistent_unstable_readings", f"{len(ph_jumps)} big jumps (> {jump_threshold}) in last 60s.")
+        old_ph_value = filtered_ph
 
-                    log_with_timestamp(f"[DEBUG] Ignored jump (delta {delta:.2f} > {jump_threshold})")
-                    continue
+        # Single reference assignment; no lock needed on the hot path.
+        latest_ph_value = filtered_ph
+        if _ph_debug:
+            log_with_timestamp("Accepted new pH reading: %s", filtered_ph)
 
-            old_ph_value = filtered_ph
-
-            with ph_lock:
-                latest_ph_value = filtered_ph
-                log_with_timestamp(f"Accepted new pH reading: {filtered_ph}")
-
-            old_ph_value = filtered_ph
-            last_read_time = datetime.now()
-
-            ph_recent_values.append(filtered_ph)
-            if len(ph_recent_values) > PH_ROLLING_WINDOW:
-                ph_recent_values.pop(0)
-
-            s = load_settings()
-            ph_min = s.get("ph_range", {}).get("min", 5.5)
-            ph_max = s.get("ph_range", {}).get("max", 6.5)
-            if len(ph_recent_values) >= PH_ROLLING_WINDOW:
-                avg_ph = sum(ph_recent_values) / len(ph_recent_values)
-                if avg_ph < ph_min or avg_ph > ph_max:
-                    set_status(
-                        "ph_probe",
-                        "out_of_range",
-                        "error",
-                        f"Average pH {avg_ph:.2f} over last {PH_ROLLING_WINDOW} readings is outside recommended range [{ph_min}, {ph_max}]."
-                    )
-                else:
-                    set_status("ph_probe", "out_of_range", "ok",
-                               f"Average pH {avg_ph:.2f} is within recommended range [{ph_min}, {ph_max}].")
+        old_ph_value = filtered_ph
+        last_read_time = time.monotonic()
+
+        ph_recent_values.append(filtered_ph)
 
-            from status_namespace import emit_status_update
-            emit_status_update()
+        if len(ph_recent_values) >= PH_ROLLING_WINDOW:
+            avg_ph = sum(ph_recent_values) / len(ph_recent_values)
+            if avg_ph < ph_min or avg_ph > ph_max:
+                status_changed |= _set_status_if_changed(
+                    "out_of_range",
+                    "error",
+                    f"Average pH {avg_ph:.2f} over last {PH_ROLLING_WINDOW} readings is outside recommended range [{ph_min}, {ph_max}].",
+                    stable=(ph_min, ph_max)
+                )
+            else:
+                # Keyed on the range: a new average alone is only refreshed
+                # every STATUS_REFRESH_INTERVAL.
+                status_changed |= _set_status_if_changed("out_of_range", "ok",
+                                                         f"Average pH {avg_ph:.2f} is within recommended range [{ph_min}, {ph_max}].",
+                                                         stable=(ph_min, ph_max))
+
+    _compact_buffer()
 
-        except ValueError as e:
-            log_with_timestamp(f"[DEBUG] parse_buffer ignoring line '{line}': {e}")
+    if status_changed:
+        _emit_status()
 
-    if buffer:
-        log_with_timestamp(f"[DEBUG] leftover buffer: {buffer!r}")
+    if buffer and _ph_debug:
+        log_with_timestamp("[DEBUG] leftover buffer: %r", buffer)
     if len(buffer) > MAX_BUFFER_LENGTH // 2:
         log_with_timestamp("[DEBUG] Buffer growing large; possible missing terminators due to noise.")
 
-def serial_reader():
-    global ser, buffer, latest_ph_value, old_ph_value, last_read_time
+# Self-pipe: stop_serial_reader() and enqueue_command() write a byte here to
+# wake a reader parked in select() on the port, instead of it waiting out
+# READ_WAIT_TIMEOUT.
+# Shared by every reader generation, which is safe because restart and
+# start_serial_reader() never let two readers run at once.
+# Both ends are only touched once select() says they are ready: the
+# monkey-patched os.read/os.write would park on an empty or full pipe.
+_wake_r, _wake_w = os.pipe()
+
+def _wake_reader():
+    """Rouses the reader from its select() so it rechecks stop and the queue."""
+    if select.select([], [_wake_w], [], 0)[1]:
+        os.write(_wake_w, b"x")  # A full pipe already has a wake-up pending
+
+def _drain_wake_pipe():
+    """Discards pending wake-up bytes so they don't wake the next wait."""
+    while select.select([_wake_r], [], [], 0)[0]:
+        os.read(_wake_r, 64)
+
+# Sent when the running serial_reader returns; starts "sent" (none running)
+READER_STOP_TIMEOUT = 5  # seconds
+_reader_done = event.Event()
+_reader_done.send()
+
+def serial_reader(done=None):
+    """
+    Runs the pH reader loop, sending `done` when it returns.
+    start_serial_reader() passes the event it already published as
+    _reader_done; a direct call (as app.py makes) publishes its own.
+    """
+    global _reader_done
+    if done is None:
+        done = _reader_done = event.Event()
+    try:
+        _serial_reader_loop()
+    finally:
+        done.send()
+
+def _serial_reader_loop():
+    global ser, latest_ph_value, old_ph_value, last_read_time
 
     print("DEBUG: Entered serial_reader() at all...")
+    _drain_wake_pipe()  # Left over from a stop with no reader parked
     consecutive_fails = 0
     consecutive_read_errors = 0
     consecutive_fatal_exceptions = 0
+    consecutive_overflows = 0
     MAX_FAILS = 5
-    READ_ERROR_THRESHOLD = 10
+    OVERFLOW_ERROR_THRESHOLD = 3
+    READ_WAIT_TIMEOUT = 1.0
+    READ_ERROR_THRESHOLD = 10  # ~10s of silence at READ_WAIT_TIMEOUT
     FATAL_ERROR_THRESHOLD = 2
     last_no_reading_error_time = None
 
     while not stop_event.ready():
-        settings = load_settings()
+        refresh_debug_flag()
+        settings = _get_cached_settings()
         ph_probe_path = settings.get("usb_roles", {}).get("ph_probe")
 
         if not ph_probe_path:
-            clear_status("ph_probe", "communication")
-            clear_status("ph_probe", "reading")
-            clear_status("ph_probe", "ph_value")
-            eventlet.sleep(5)
+            _clear_status("communication")
+            _clear_status("reading")
+            _clear_status("ph_value")
+            stop_event.wait(5)  # Returns early on stop
             continue
 
         try:
-            try:
-                dev_list = subprocess.check_output("ls /dev/serial/by-id", shell=True).decode().splitlines()
+            if _ph_debug:
+                # Directory listing only; no shell/ls subprocess per reconnect.
+                try:
+                    dev_list = os.listdir("/dev/serial/by-id")
+                except FileNotFoundError:
+                    dev_list = []
                 dev_list_str = ", ".join(dev_list) if dev_list else "No devices found"
-                log_with_timestamp(f"[DEBUG] Found devices: {dev_list_str}")
-            except subprocess.CalledProcessError:
-                log_with_timestamp("[DEBUG] No devices found in /dev/serial/by-id (subprocess error).")
+                log_with_timestamp("[DEBUG] Found devices: %s", dev_list_str)
 
-            log_with_timestamp(f"[DEBUG] Trying to open serial port: {ph_probe_path}")
-            ser = serial.Serial(ph_probe_path, baudrate=9600, timeout=1)
+            log_with_timestamp("[DEBUG] Trying to open serial port: %s", ph_probe_path)
+            # Non-blocking port: reads return immediately so the reader
+            # greenlet never needs a tpool OS-thread hop.
+            ser = serial.Serial(ph_probe_path, baudrate=9600, timeout=0)
             consecutive_fails = 0
             consecutive_fatal_exceptions = 0
 
-            set_status("ph_probe", "communication", "ok",
-                       f"Opened {ph_probe_path} for pH reading.")
+            _set_status_if_changed("communication", "ok",
+                                   f"Opened {ph_probe_path} for pH reading.")
             clear_error("PH_USB_OFFLINE")
 
-            with ph_lock:
-                buffer = ""
-                old_ph_value = None
-                latest_ph_value = None
-                last_read_time = None
-                log_with_timestamp("[DEBUG] Buffer cleared on new device connection.")
+            # Only the reader greenlet touches this state between reads.
+            _clear_buffer()
+            old_ph_value = None
+            latest_ph_value = None
+            last_read_time = None
+            log_with_timestamp("[DEBUG] Buffer cleared on new device connection.")
 
             log_with_timestamp("[DEBUG] Enabling continuous read mode now that the device is open.")
-            send_command_to_probe(ser, "C,1")
+            _dispatch(ser, "C,1")
 
             while not stop_event.ready():
                 if last_read_time:
-                    elapsed = (datetime.now() - last_read_time).total_seconds()
-                    if elapsed > 30:
+                    # Monotonic floats: plain subtraction, immune to wall-clock jumps.
+                    now = time.monotonic()
+                    if now - last_read_time > 30:
                         if not last_no_reading_error_time or \
-                           (datetime.now() - last_no_reading_error_time).total_seconds() > 30:
-                            set_status("ph_probe", "reading", "error",
-                                       "No pH reading available for 30+ seconds.")
-                            last_no_reading_error_time = datetime.now()
+                           now - last_no_reading_error_time > 30:
+                            _set_status_if_changed("reading", "error",
+                                                   "No pH reading available for 30+ seconds.")
+                            last_no_reading_error_time = now
 
                 try:
-                    raw_data = tpool.execute(ser.read, 100)
+                    # Park on the port's fd and the wake pipe until bytes
+                    # arrive, stop_serial_reader() wakes us, or the wait
+                    # times out, instead of polling on a fixed interval.
+                    fd = ser.fileno()
+                    ready, _, _ = select.select([fd, _wake_r], [], [], READ_WAIT_TIMEOUT)
+                    if _wake_r in ready:
+                        _drain_wake_pipe()
+                    if stop_event.ready():
+                        break  # stop_serial_reader() ran while we were parked
+                    if ready and fd not in ready:
+                        # Woken for a queued command: send it without
+                        # counting an empty read.
+                        _service_command_queue(ser)
+                        continue
+                    # Drain whatever the OS has buffered in one call.
+                    raw_data = ser.read(ser.in_waiting or 1)
                     if not raw_data:
+                        # Nothing to parse, but queued commands still need to go
+                        # out (e.g. after C,0 the probe stays silent).
+                        _service_command_queue(ser)
                         consecutive_read_errors += 1
-                        log_with_timestamp(f"[DEBUG] read() returned no data => consecutive_read_errors={consecutive_read_errors}")
+                        if _ph_debug:
+                            log_with_timestamp("[DEBUG] read() returned no data => consecutive_read_errors=%d", consecutive_read_errors)
                         if consecutive_read_errors < READ_ERROR_THRESHOLD:
-                            log_with_timestamp("[DEBUG] Ignoring short read glitch, continuing.")
-                            eventlet.sleep(0.05)
                             continue
                         else:
                             raise serial.SerialException(
@@ -366,30 +722,45 @@ def serial_reader():
                     else:
                         if consecutive_read_errors > 0:
                             log_with_timestamp(
-                                f"[DEBUG] reset consecutive_read_errors from {consecutive_read_errors} to 0"
+                                "[DEBUG] reset consecutive_read_errors from %d to 0", consecutive_read_errors
                             )
                         consecutive_read_errors = 0
 
                         if consecutive_fatal_exceptions > 0:
                             log_with_timestamp(
-                                f"[DEBUG] reset consecutive_fatal_exceptions from {consecutive_fatal_exceptions} to 0"
+                                "[DEBUG] reset consecutive_fatal_exceptions from %d to 0", consecutive_fatal_exceptions
                             )
                         consecutive_fatal_exceptions = 0
 
-                        decoded_data = raw_data.decode("utf-8", errors="replace")
-                        with ph_lock:
-                            buffer += decoded_data
-                            if len(buffer) > MAX_BUFFER_LENGTH:
-                                log_with_timestamp("[DEBUG] Buffer exceeded max length. Dumping buffer.")
-                                set_status("ph_probe", "communication", "error",
-                                           "Buffer exceeded max length. Dumping buffer.")
-                                buffer = ""
-                        parse_buffer(ser)
+                        # `buffer` is only written by this greenlet, and resets
+                        # elsewhere never yield midway, so no lock is needed.
+                        buffer.extend(raw_data)
+                        # Each pass consumes every complete line, so the
+                        # leftover never holds a terminator: without one in
+                        # this chunk there is nothing new to parse.
+                        if b"\r" in raw_data:
+                            parse_buffer(ser)
+
+                        # Complete lines are gone now; only a run of bytes with
+                        # no terminator can exceed the cap.
+                        if len(buffer) > MAX_BUFFER_LENGTH:
+                            # Drop only the oldest bytes; the tail may hold a
+                            # line still arriving.
+                            dropped = len(buffer) - MAX_BUFFER_LENGTH // 2
+                            _drop_oldest(dropped)
+                            consecutive_overflows += 1
+                            log_with_timestamp("[DEBUG] Buffer exceeded max length. Dropped %d oldest bytes, kept last %d.", dropped, len(buffer))
+                            if consecutive_overflows >= OVERFLOW_ERROR_THRESHOLD:
+                                _set_status_if_changed("communication", "error",
+                                                       f"Buffer exceeded max length on {consecutive_overflows} consecutive reads.")
+                        else:
+                            consecutive_overflows = 0
 
                 except (serial.SerialException, OSError) as read_ex:
                     consecutive_fatal_exceptions += 1
                     log_with_timestamp(
-                        f"[DEBUG] Fatal read exception => consecutive_fatal_exceptions={consecutive_fatal_exceptions}. {read_ex}"
+                        "[DEBUG] Fatal read exception => consecutive_fatal_exceptions=%d. %s",
+                        consecutive_fatal_exceptions, read_ex
                     )
 
                     if consecutive_fatal_exceptions < FATAL_ERROR_THRESHOLD:
@@ -400,21 +771,23 @@ def serial_reader():
                         log_with_timestamp("[DEBUG] Exceeded FATAL_ERROR_THRESHOLD => forcing reconnect.")
                         raise read_ex
 
-                eventlet.sleep(0.01)
+                # Yield to other greenlets after each parse pass.
+                eventlet.sleep(0)
 
         except (serial.SerialException, OSError) as e:
             consecutive_fails += 1
             log_with_timestamp(
-                f"[DEBUG] consecutive_fails incremented => {consecutive_fails}. "
-                f"Serial error on {ph_probe_path}: {e} | Reconnecting in 5s..."
+                "[DEBUG] consecutive_fails incremented => %d. "
+                "Serial error on %s: %s | Reconnecting in 5s...",
+                consecutive_fails, ph_probe_path, e
             )
 
             if consecutive_fails >= MAX_FAILS:
-                set_status("ph_probe", "communication", "error",
-                           f"Cannot open {ph_probe_path} after {consecutive_fails} attempts.")
+                _set_status_if_changed("communication", "error",
+                                       f"Cannot open {ph_probe_path} after {consecutive_fails} attempts.")
 
             set_error("PH_USB_OFFLINE")
-            eventlet.sleep(5)
+            stop_event.wait(5)  # Returns early on stop
 
         finally:
             if ser and ser.is_open:
@@ -425,121 +798,164 @@ def send_configuration_commands(ser):
     try:
         log_with_timestamp("[DEBUG] Sending default config commands: 'C,2'")
         command = "C,2"
-        send_command_to_probe(ser, command)
+        _dispatch(ser, command)
     except Exception as e:
-        log_with_timestamp(f"[DEBUG] Error sending configuration commands: {e}")
-
-def calibrate_ph(ser, level):
-    valid_levels = {
-        'low': 'Cal,low,4.00',
-        'mid': 'Cal,mid,7.00',
-        'high': 'Cal,high,10.00',
-        'clear': 'Cal,clear'
-    }
+        log_with_timestamp("[DEBUG] Error sending configuration commands: %s", e)
 
-    global last_sent_command
-    if level not in valid_levels:
-        log_with_timestamp(f"[DEBUG] Invalid calibration level: {level}")
-        return {"status": "failure", "message": "Invalid calibration level"}
-
-    with ph_lock:
-        command = valid_levels[level]
-        if last_sent_command is None:
-            log_with_timestamp(f"[DEBUG] calibrate_ph() -> sending: {command}")
-            send_command_to_probe(ser, command)
-            last_sent_command = command
-            return {"status": "success", "message": f"Calibration command '{command}' sent"}
-        else:
-            msg = f"[DEBUG] calibrate_ph() -> cannot send '{command}' while waiting for response."
-            log_with_timestamp(msg)
-            return {"status": "failure", "message": "A command is already in progress"}
+def calibrate_ph(level):
+    """
+    Sends a calibration command through the reader's command queue, so it
+    goes out on the port serial_reader already holds and only once the
+    previous command has been answered, then waits up to CALIBRATION_TIMEOUT
+    for parse_buffer to report the probe's *OK/*ER for it.
+    """
+    global _calibration_waiter
+    log_with_timestamp("[DEBUG] calibrate_ph(%s) -> handing off to the reader queue", level)
+    if level not in CALIBRATION_COMMANDS:
+        return enqueue_calibration(level)
+
+    command = CALIBRATION_COMMANDS[level]
+    done = event.Event()
+    _calibration_waiter = (command, done)
+    try:
+        enqueue_calibration(level)
+        response = done.wait(CALIBRATION_TIMEOUT)
+    finally:
+        if _calibration_waiter and _calibration_waiter[1] is done:
+            _calibration_waiter = None
+
+    if response == "*OK":
+        return {"status": "success", "message": f"Calibration command '{command}' acknowledged."}
+    if response == "*ER":
+        return {"status": "failure", "message": f"Probe rejected calibration command '{command}'."}
+    log_with_timestamp("[DEBUG] calibrate_ph(%s) -> no response within %ss", level, CALIBRATION_TIMEOUT)
+    return {"status": "failure", "message": f"No response to calibration command '{command}'."}
 
 def enqueue_calibration(level):
-    valid_levels = {
-        'low': 'Cal,low,4.00',
-        'mid': 'Cal,mid,7.00',
-        'high': 'Cal,high,10.00',
-        'clear': 'Cal,clear'
-    }
-    if level not in valid_levels:
+    if level not in CALIBRATION_COMMANDS:
         return {
             "status": "failure",
             "message": f"Invalid calibration level: {level}. "
-                       f"Must be one of {list(valid_levels.keys())}."
+                       f"Must be one of {list(CALIBRATION_COMMANDS.keys())}."
         }
-    command = valid_levels[level]
-    log_with_timestamp(f"[DEBUG] enqueue_calibration('{level}') -> puts '{command}' in queue")
-    command_queue.put({"command": command, "type": "calibration"})
+    command = CALIBRATION_COMMANDS[level]
+    log_with_timestamp("[DEBUG] enqueue_calibration('%s') -> puts '%s' in queue", level, command)
+    enqueue_command(command, "calibration")
     return {"status": "success", "message": f"Calibration command '{command}' enqueued."}
 
 def restart_serial_reader():
-    global stop_event, buffer, latest_ph_value
+    global stop_event, latest_ph_value
     log_with_timestamp("[DEBUG] restart_serial_reader() called.")
+    reset_settings_cache()  # Pick up a reassigned device path immediately
 
-    with ph_lock:
-        buffer = ""
-        latest_ph_value = None
-        log_with_timestamp("[DEBUG] Buffer and latest pH value cleared for restart.")
+    _clear_buffer()
+    latest_ph_value = None
+    log_with_timestamp("[DEBUG] Buffer and latest pH value cleared for restart.")
 
     stop_serial_reader()
-    eventlet.sleep(1)
-    stop_event = event.Event()
-    start_serial_reader()
+    previous = _reader_done
+    # Wait for the old loop to actually exit rather than a fixed sleep.
+    previous.wait(READER_STOP_TIMEOUT)
+    if not previous.ready():
+        log_with_timestamp("[DEBUG] restart_serial_reader() -> old reader still running after %ss; "
+                           "starting the new one once it exits.", READER_STOP_TIMEOUT)
+        eventlet.spawn(_restart_when_done, previous)
+        return
+    _restart_when_done(previous)
+
+def _restart_when_done(previous):
+    """
+    Starts a fresh reader once `previous` (the stopped reader's done event)
+    has fired. Two readers must never share the port and the wake pipe, so
+    nothing starts early; if another restart got there first, this is a no-op.
+    """
+    global stop_event
+    previous.wait()
+    if _reader_done is previous:
+        stop_event = event.Event()
+        start_serial_reader()
 
 def get_last_sent_command():
     global last_sent_command
     result = last_sent_command if last_sent_command else "No command has been sent yet."
-    log_with_timestamp(f"[DEBUG] get_last_sent_command() -> {result}")
+    log_with_timestamp("[DEBUG] get_last_sent_command() -> %s", result)
     return result
 
 def start_serial_reader():
+    global _reader_done
+    if not _reader_done.ready():
+        log_with_timestamp("[DEBUG] start_serial_reader() -> a reader is still running; not spawning another.")
+        return
     log_with_timestamp("[DEBUG] start_serial_reader() -> spawning serial_reader thread.")
-    eventlet.spawn(serial_reader)
+    # Publish the pending event before the greenlet runs, so a restart in
+    # between waits for this reader rather than the one already finished.
+    done = _reader_done = event.Event()
+    eventlet.spawn(serial_reader, done)
 
 def stop_serial_reader():
-    global buffer, latest_ph_value, ser
+    global latest_ph_value, ser
     log_with_timestamp("[DEBUG] stop_serial_reader() called.")
 
-    with ph_lock:
-        buffer = ""
-        latest_ph_value = None
-        log_with_timestamp("[DEBUG] Buffer and latest pH value cleared during stop.")
+    _clear_buffer()
+    latest_ph_value = None
+    log_with_timestamp("[DEBUG] Buffer and latest pH value cleared during stop.")
 
-    if ser and ser.is_open:
+    # A running reader may be parked on the port's fd; it closes the port
+    # itself once the wake pipe below rouses it.
+    if _reader_done.ready() and ser and ser.is_open:
         ser.close()
         log_with_timestamp("[DEBUG] Serial connection closed.")
 
-    stop_event.send()
+    if not stop_event.ready():
+        stop_event.send()
+    _wake_reader()
     log_with_timestamp("[DEBUG] serial_reader stopped via event.")
 
+# "Nothing to return" debug lines from get_latest_ph_reading, at most one per interval
+EMPTY_LOG_INTERVAL = 10.0  # seconds
+_last_empty_log = 0.0
+
+def _log_empty_reading(message):
+    global _last_empty_log
+    now = time.monotonic()
+    if now - _last_empty_log > EMPTY_LOG_INTERVAL:
+        _last_empty_log = now
+        log_with_timestamp(message)
+
 def get_latest_ph_reading():
     global latest_ph_value
-    settings = load_settings()
+    settings = _get_cached_settings()  # Polled often; no JSON parse per call
     ph_probe_path = settings.get("usb_roles", {}).get("ph_probe")
     if not ph_probe_path:
-        log_with_timestamp("[DEBUG] get_latest_ph_reading() -> no pH device assigned.")
+        _log_empty_reading("[DEBUG] get_latest_ph_reading() -> no pH device assigned.")
         return None
 
-    with ph_lock:
-        if latest_ph_value is not None:
-            rounded_ph = round(latest_ph_value, 2)
-            log_with_timestamp(f"[DEBUG] get_latest_ph_reading() -> returning {rounded_ph}")
-            return rounded_ph
+    # parse_buffer publishes with a single assignment; one read of the global
+    # is enough, no lock needed.
+    value = latest_ph_value
+    if value is not None:
+        rounded_ph = round(value, 2)
+        log_with_timestamp("[DEBUG] get_latest_ph_reading() -> returning %s", rounded_ph)
+        return rounded_ph
 
-    log_with_timestamp("[DEBUG] get_latest_ph_reading() -> no pH reading available.")
+    _log_empty_reading("[DEBUG] get_latest_ph_reading() -> no pH reading available.")
     return None
 
 def graceful_exit(signum, frame):
-    log_with_timestamp(f"[DEBUG] Received signal {signum}. Doing graceful_exit...")
+    log_with_timestamp("[DEBUG] Received signal %s. Doing graceful_exit...", signum)
     try:
         stop_serial_reader()
+        # Let the reader finish its pass and close the port, but no longer
+        # than READER_STOP_TIMEOUT; no fixed sleep.
+        _reader_done.wait(READER_STOP_TIMEOUT)
     except Exception as e:
-        log_with_timestamp(f"[DEBUG] Error during cleanup: {e}")
+        log_with_timestamp("[DEBUG] Error during cleanup: %s", e)
     log_with_timestamp("[DEBUG] Cleanup complete. Exiting.")
+    _flush_log_queue()  # The drainer greenlet won't run again after this
     raise SystemExit()
 
 def handle_stop_signal(signum, frame):
-    log_with_timestamp(f"[DEBUG] Received signal {signum} (SIGTSTP). will graceful_exit..")
+    log_with_timestamp("[DEBUG] Received signal %s (SIGTSTP). will graceful_exit..", signum)
     graceful_exit(signum, frame)
 
 def enqueue_disable_continuous():
@@ -572,14 +988,14 @@ def enqueue_slope_query():
     enqueue_command("Slope,?", "slope_query")
 
     log_with_timestamp("[DEBUG] enqueue_slope_query() -> about to WAIT up to 10s for slope_event.")
-    try:
-        with eventlet.timeout.Timeout(10, False):
-            slope_event.wait()
-    except eventlet.timeout.Timeout:
+    # parse_buffer reads the reply off the shared serial stream and sends
+    # slope_event; a single timed wait replaces any polling here.
+    slope_event.wait(10)
+    if not slope_event.ready():
         log_with_timestamp("[DEBUG] enqueue_slope_query() -> Timed out waiting for slope_event.")
         return None
 
-    log_with_timestamp(f"[DEBUG] enqueue_slope_query() -> we got slope_event, slope_data={slope_data}")
+    log_with_timestamp("[DEBUG] enqueue_slope_query() -> we got slope_event, slope_data=%s", slope_data)
     return slope_data
 
 def get_slope_info():
@@ -592,5 +1008,5 @@ def get_slope_info():
     if result is None:
         log_with_timestamp("[DEBUG] get_slope_info() -> slope_data is None (timed out or not found).")
     else:
-        log_with_timestamp(f"[DEBUG] get_slope_info() -> success, slope_data={result}")
+        log_with_timestamp("[DEBUG] get_slope_info() -> success, slope_data=%s", result)
     return result
\ No newline at end of file